@@ -23,10 +23,21 @@ def initialize_session_state():
     """Initialize Streamlit session state variables."""
     if 'session_id' not in st.session_state:
         st.session_state.session_id = str(uuid.uuid4())
+    if 'budget_id' not in st.session_state:
+        st.session_state.budget_id = str(uuid.uuid4())
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
-    if 'lab_results' not in st.session_state:
-        st.session_state.lab_results = None
+    if 'panel_snapshot' not in st.session_state:
+        st.session_state.panel_snapshot = None
+
+
+def get_budget_key() -> str:
+    """Get the key token budgets are charged to.
+
+    Unlike session_id, budget_id is not reset by "Clear Session", so clearing
+    the chat cannot be used to obtain a fresh token budget.
+    """
+    return st.session_state.budget_id
 
 
 def setup_sidebar(security_manager: SecurityManager) -> tuple:
@@ -58,7 +69,7 @@ def setup_sidebar(security_manager: SecurityManager) -> tuple:
         if st.button("Clear Session", type="primary"):
             # Clear all session state variables
             st.session_state.chat_history = []
-            st.session_state.lab_results = None
+            st.session_state.panel_snapshot = None
             st.session_state.session_cleared = True
 
             # Generate new session ID
@@ -77,15 +88,15 @@ def setup_sidebar(security_manager: SecurityManager) -> tuple:
     return api_key, use_sample_data
 
 
-def display_lab_results_overview(lab_results, chatbot):
+def display_lab_results_overview(panel, chatbot):
     """Display the lab results overview section."""
     col1, col2 = st.columns([2, 1])
 
     with col1:
         st.header("Lab Results Overview")
 
-        # Create and display results dataframe
-        df = format_lab_results_dataframe(lab_results)
+        # Display the precomputed results dataframe
+        df = format_lab_results_dataframe(panel)
 
         if not df.empty:
             # Apply styling
@@ -99,18 +110,35 @@ def display_lab_results_overview(lab_results, chatbot):
 
     with col2:
         st.header("Quick Insights")
-        insights = chatbot.get_quick_insights(lab_results)
+        insights = chatbot.get_quick_insights(panel)
 
         st.metric("Normal Results", insights['normal'])
         st.metric("Borderline Results", insights['borderline'])
         st.metric("Abnormal Results", insights['abnormal'])
 
-        if insights['critical'] > 0:
+        if panel.has_critical:
             st.metric("Critical Results", insights['critical'])
             st.error("⚠️ Critical results detected! Consult your healthcare provider immediately.")
 
 
-def handle_chat_interface(chatbot, lab_results):
+def display_token_usage(chatbot):
+    """Display token usage counters in the sidebar."""
+    usage = chatbot.get_usage_stats(get_budget_key())
+    session, process = usage['session'], usage['process']
+
+    with st.sidebar:
+        st.header("Token Usage")
+        st.metric("Session Tokens Used", session['prompt_tokens'] + session['completion_tokens'])
+        st.metric("Session Budget Available", session['available_tokens'])
+        st.metric("Server Tokens Used", process['prompt_tokens'] + process['completion_tokens'])
+        st.metric("Server Budget Available", process['available_tokens'])
+        st.caption(
+            f"Requests: {session['requests']} this session, {process['requests']} total · "
+            f"Shed: {session['shed']} this session, {process['shed']} total"
+        )
+
+
+def handle_chat_interface(chatbot, panel):
     """Handle the chat interface functionality."""
     st.header("Ask Questions About Your Results")
 
@@ -132,8 +160,9 @@ def handle_chat_interface(chatbot, lab_results):
             with st.spinner("Analyzing your question..."):
                 response = chatbot.process_query(
                     prompt,
-                    lab_results,
-                    st.session_state.session_id
+                    panel,
+                    st.session_state.session_id,
+                    budget_key=get_budget_key()
                 )
             st.write(response)
 
@@ -141,7 +170,7 @@ def handle_chat_interface(chatbot, lab_results):
         st.session_state.chat_history.append({"role": "assistant", "content": response})
 
 
-def display_suggested_questions(chatbot, lab_results):
+def display_suggested_questions(chatbot, panel):
     """Display suggested questions section."""
     st.header("Suggested Questions")
 
@@ -164,8 +193,9 @@ def display_suggested_questions(chatbot, lab_results):
 
         response = chatbot.process_query(
             query,
-            lab_results,
-            st.session_state.session_id
+            panel,
+            st.session_state.session_id,
+            budget_key=get_budget_key()
         )
 
         st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -200,22 +230,27 @@ def main():
         # Initialize chatbot
         chatbot = MedicalChatbot(api_key)
 
-        # Load lab results
-        if use_sample_data and st.session_state.lab_results is None:
-            st.session_state.lab_results = parser.parse_sample_report()
+        # Load lab results as a precomputed snapshot, cached for the session
+        if use_sample_data and st.session_state.panel_snapshot is None:
+            st.session_state.panel_snapshot = parser.parse_sample_panel()
 
-        if st.session_state.lab_results:
+        panel = st.session_state.panel_snapshot
+
+        if panel:
             # Display medical disclaimer
             st.warning(get_medical_disclaimer())
 
             # Display lab results overview
-            display_lab_results_overview(st.session_state.lab_results, chatbot)
+            display_lab_results_overview(panel, chatbot)
 
             # Chat interface
-            handle_chat_interface(chatbot, st.session_state.lab_results)
+            handle_chat_interface(chatbot, panel)
 
             # Suggested questions
-            display_suggested_questions(chatbot, st.session_state.lab_results)
+            display_suggested_questions(chatbot, panel)
+
+            # Token usage counters (rendered last so they include this run's queries)
+            display_token_usage(chatbot)
 
         else:
             st.info("Please enable 'Use Sample Lab Data' in the sidebar to get started.")
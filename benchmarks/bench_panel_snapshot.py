@@ -0,0 +1,133 @@
+"""Benchmark PanelSnapshot against the previous piecemeal interpretation.
+
+Run from the repository root:
+
+    python benchmarks/bench_panel_snapshot.py
+"""
+
+import argparse
+import logging
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import SAMPLE_LAB_DATA  # noqa: E402
+from models import LabResult, PanelSnapshot, RiskLevel  # noqa: E402
+from services.parser import MedicalReportParser  # noqa: E402
+
+PANEL_SIZES = [10, 100, 1000, 10000]
+
+
+def build_panel(size: int, seed: int = 0) -> List[LabResult]:
+    """Build a synthetic panel by jittering the sample report values."""
+    rng = random.Random(seed)
+    parser = MedicalReportParser()
+    results = []
+
+    for i in range(size):
+        name, value, unit, ref_range = SAMPLE_LAB_DATA[i % len(SAMPLE_LAB_DATA)]
+        value = round(value * rng.uniform(0.4, 2.2), 1)
+        results.append(LabResult(
+            test_name=name,
+            value=value,
+            unit=unit,
+            reference_range=ref_range,
+            status=parser.determine_status(name, value),
+            description=parser.get_test_description(name)
+        ))
+
+    return results
+
+
+def legacy_render(lab_results: List[LabResult]) -> tuple:
+    """The pre-snapshot per-rerun work: four separate passes over the panel."""
+    rows = []
+    for result in lab_results:
+        rows.append({
+            'Test': result.test_name,
+            'Value': f"{result.value} {result.unit}",
+            'Reference Range': result.reference_range,
+            'Status': result.status.value,
+            'Description': result.description
+        })
+    df = pd.DataFrame(rows)
+
+    insights = {'normal': 0, 'borderline': 0, 'abnormal': 0, 'critical': 0}
+    for result in lab_results:
+        if result.status == RiskLevel.NORMAL:
+            insights['normal'] += 1
+        elif result.status == RiskLevel.BORDERLINE:
+            insights['borderline'] += 1
+        elif result.status in [RiskLevel.HIGH, RiskLevel.LOW]:
+            insights['abnormal'] += 1
+        elif result.status == RiskLevel.CRITICAL:
+            insights['critical'] += 1
+
+    abnormal = [result for result in lab_results if result.is_abnormal()]
+
+    context = "Patient Lab Results:\n\n"
+    for result in lab_results:
+        context += (
+            f"{result.get_status_emoji()} {result.test_name}: {result.value} {result.unit} "
+            f"(Reference: {result.reference_range}) - Status: {result.status.value}\n"
+        )
+
+    return df, insights, abnormal, context
+
+
+def snapshot_render(snapshot: PanelSnapshot) -> tuple:
+    """Per-rerun work once the snapshot is cached in session state."""
+    return snapshot.display_frame, snapshot.insights, snapshot.abnormal, snapshot.context
+
+
+def best_time(fn, number: int, repeat: int) -> float:
+    """Best average seconds per call over several repeats."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def run(sizes: List[int], repeat: int) -> List[Dict[str, float]]:
+    rows = []
+
+    for size in sizes:
+        panel = build_panel(size)
+        snapshot = PanelSnapshot.from_results(panel)
+
+        legacy = legacy_render(panel)
+        assert legacy[3] == snapshot.context
+        assert legacy[1] == snapshot.insights.to_dict()
+        assert legacy[0].equals(snapshot.display_frame)
+
+        number = max(1, 2000 // size)
+        rows.append({
+            'size': size,
+            'legacy_ms': best_time(lambda: legacy_render(panel), number, repeat) * 1000,
+            'build_ms': best_time(lambda: PanelSnapshot.from_results(panel), number, repeat) * 1000,
+            'cached_us': best_time(lambda: snapshot_render(snapshot), 1000, repeat) * 1e6
+        })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lab panel interpretation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=PANEL_SIZES,
+                        help="Panel sizes (number of tests) to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per size")
+    args = parser.parse_args()
+
+    # Synthetic panels reuse tests without reference ranges; silence those warnings
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"{'Tests':>8} {'Legacy/rerun (ms)':>18} {'Snapshot build (ms)':>20} {'Cached read (us)':>17}")
+    for row in run(args.sizes, args.repeat):
+        print(f"{row['size']:>8} {row['legacy_ms']:>18.3f} {row['build_ms']:>20.3f} {row['cached_us']:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
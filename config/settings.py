@@ -1,5 +1,6 @@
 """Configuration settings for the medical chatbot application."""
 
+from pathlib import Path
 from typing import Dict, Any
 
 # OpenAI Configuration
@@ -86,4 +87,18 @@ STREAMLIT_CONFIG = {
     "page_title": "Medical Report Assistant",
     "page_icon": "🏥",
     "layout": "wide"
-}
\ No newline at end of file
+}
+
+# Token Budget Configuration
+TOKEN_BUDGET_CONFIG = {
+    "session_tokens_per_minute": 10000,
+    "session_burst_tokens": 10000,
+    "process_tokens_per_minute": 90000,
+    "process_burst_tokens": 90000,
+    "max_queue_wait_seconds": 10.0,
+    "session_idle_ttl_seconds": 3600,
+    "default_chars_per_token": 4.0,
+    # Tokenizer is only loaded from this local cache; it is never downloaded at runtime
+    "tokenizer_encoding": "cl100k_base",
+    "tokenizer_cache_dir": str(Path(__file__).resolve().parent / "tiktoken_cache")
+}
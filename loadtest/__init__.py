@@ -0,0 +1,4 @@
+from .fake_openai import FakeCompletionServer
+from .harness import LoadTestConfig, LoadTestReport, run_load_test
+
+__all__ = ['FakeCompletionServer', 'LoadTestConfig', 'LoadTestReport', 'run_load_test']
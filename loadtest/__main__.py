@@ -0,0 +1,48 @@
+"""Command line entry point: python -m loadtest."""
+
+import argparse
+import logging
+
+from .harness import LoadTestConfig, run_load_test, format_report, compare_with
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Medical Report Assistant.")
+    parser.add_argument("--sessions", type=int, default=10, help="Number of simulated users")
+    parser.add_argument("--concurrency", type=int, default=5, help="Sessions running at once")
+    parser.add_argument("--turns", type=int, default=4, help="Questions asked per session")
+    parser.add_argument("--server-latency", type=float, default=0.2,
+                        help="Seconds the fake completion server waits before replying")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-run AppTest timeout")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for question selection")
+    parser.add_argument("--label", default="default", help="Name for this configuration")
+    parser.add_argument("--save", help="Write the report as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    config = LoadTestConfig(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        turns=args.turns,
+        server_latency=args.server_latency,
+        timeout=args.timeout,
+        seed=args.seed,
+        label=args.label
+    )
+
+    report = run_load_test(config)
+    print(format_report(report))
+
+    comparison = compare_with(args.compare, report)
+    if comparison:
+        print()
+        print(comparison)
+
+    if args.save:
+        report.save(args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Local stand-in for the OpenAI chat completions endpoint used in load tests."""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+FAKE_REPLY = (
+    "Your results are mostly within the reference ranges. "
+    "Please consult your healthcare provider for medical advice and treatment recommendations."
+)
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/chat/completions with a canned response."""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        time.sleep(self.server.latency)
+        self.server.record_request()
+
+        prompt_chars = sum(len(m.get('content', '')) for m in body.get('messages', []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion_tokens = max(1, len(FAKE_REPLY) // 4)
+
+        payload = json.dumps({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model', 'fake-model'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": FAKE_REPLY},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep load test output readable
+        pass
+
+
+class FakeCompletionServer:
+    """Threaded HTTP server that mimics the OpenAI completions API."""
+
+    def __init__(self, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _CompletionHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.request_count = 0
+        self._lock = threading.Lock()
+        self._server.record_request = self._record_request
+        self._thread = None
+
+    def _record_request(self):
+        with self._lock:
+            self._server.request_count += 1
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to hand to the OpenAI client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def request_count(self) -> int:
+        """Number of completion requests served so far."""
+        return self._server.request_count
+
+    def start(self) -> 'FakeCompletionServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake completion server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,343 @@
+"""Drive many simulated Streamlit sessions through app.py and collect metrics."""
+
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from threading import BrokenBarrierError
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from streamlit.testing.v1 import AppTest
+
+from config.settings import TOKEN_BUDGET_CONFIG
+from services.governor import TokenGovernor, get_token_governor, install_token_governor
+from .fake_openai import FakeCompletionServer
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = str(Path(__file__).resolve().parent.parent / "app.py")
+
+CHAT_MESSAGES = [
+    "Why is my LDL cholesterol high?",
+    "Is my vitamin D level a problem?",
+    "What does my glucose result mean?",
+    "Explain my triglycerides please.",
+]
+
+
+@dataclass
+class LoadTestConfig:
+    """Parameters for a single load test run."""
+    sessions: int = 10
+    concurrency: int = 5
+    turns: int = 4
+    server_latency: float = 0.2
+    timeout: float = 60.0
+    seed: int = 0
+    label: str = "default"
+
+
+@dataclass
+class LoadTestReport:
+    """Aggregated results of a load test run."""
+    label: str
+    sessions: int
+    concurrency: int
+    interactions: int
+    failures: int
+    wall_time: float
+    throughput: float
+    p50_latency: float
+    p99_latency: float
+    latency_by_action: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    memory_per_session_kb: Optional[float] = None
+    peak_memory_kb: Optional[float] = None
+    completion_requests: int = 0
+    queued_requests: int = 0
+    shed_requests: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LoadTestReport':
+        return cls(**data)
+
+    def save(self, path: str):
+        """Write the report to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'LoadTestReport':
+        """Read a report previously written with save()."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _describe_app_error(at: AppTest) -> Optional[str]:
+    """Describe an exception or generic error banner the app surfaced, if any."""
+    if at.exception:
+        return "; ".join(str(e.value) for e in at.exception)
+    for element in at.error:
+        if "An error occurred" in str(element.value):
+            return str(element.value)
+    return None
+
+
+def _init_worker(base_url: str, timeout: float, concurrency: int, warmed_up):
+    """Point a worker process at the fake server, size its budget and warm up imports.
+
+    Each worker has its own token governor, so the process-wide budget is
+    split across workers to keep the total equal to one app process.
+    The warm-up session loads app.py, pandas and openai once so that the
+    per-session memory figures only cover what each session allocates.
+    """
+    os.environ["OPENAI_BASE_URL"] = base_url
+    logging.basicConfig(level=logging.WARNING)
+
+    budget = dict(TOKEN_BUDGET_CONFIG)
+    budget["process_tokens_per_minute"] /= concurrency
+    budget["process_burst_tokens"] /= concurrency
+    install_token_governor(TokenGovernor(budget))
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        at.run()
+        at.sidebar.text_input[0].input("sk-loadtest").run()
+        at.sidebar.checkbox[0].check().run()
+    except Exception:
+        warmed_up.abort()
+        raise
+
+    # Hold every worker until all of them, and the parent, are ready
+    warmed_up.wait()
+
+
+def _run_session(index: int, config: LoadTestConfig, trace_memory: bool = False) -> Dict:
+    """Script one user: enter key, load sample data, then ask questions.
+
+    Runs inside a worker process, since AppTest is not safe to drive from
+    several threads of one process at once. Tracing memory slows the app
+    down severalfold, so traced sessions are run separately from timed ones.
+    """
+    rng = random.Random(config.seed + index)
+    timings: List[tuple] = []
+    outcome = {'index': index, 'timings': timings, 'error': None,
+               'memory_kb': None, 'peak_memory_kb': None, 'queued': 0, 'shed': 0}
+
+    # Sessions run one at a time per worker, so the governor's deltas are this session's
+    governor = get_token_governor()
+    stats_before = governor.get_process_stats()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    def step(action: str, fn) -> bool:
+        start = time.perf_counter()
+        try:
+            fn()
+            error = _describe_app_error(at)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+        timings.append((action, time.perf_counter() - start))
+
+        if error:
+            logger.error(f"Session {index} failed during {action}: {error}")
+            outcome['error'] = f"{action}: {error}"
+            return False
+        return True
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=config.timeout)
+        if not step("initial_load", at.run):
+            return outcome
+        if not step("enter_api_key", lambda: at.sidebar.text_input[0].input("sk-loadtest").run()):
+            return outcome
+        if not step("load_sample_data", lambda: at.sidebar.checkbox[0].check().run()):
+            return outcome
+
+        for turn in range(config.turns):
+            if turn % 2 == 0:
+                key = f"suggested_{rng.randrange(6)}"
+                ok = step("suggested_question", lambda: at.button(key=key).click().run())
+            else:
+                message = rng.choice(CHAT_MESSAGES)
+                ok = step("chat_message", lambda: at.chat_input[0].set_value(message).run())
+            if not ok:
+                return outcome
+
+        if trace_memory:
+            # Measured while the session is still alive, as for a connected user
+            current, peak = tracemalloc.get_traced_memory()
+            outcome['memory_kb'] = current / 1024
+            outcome['peak_memory_kb'] = peak / 1024
+        return outcome
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+        stats_after = governor.get_process_stats()
+        outcome['queued'] = stats_after['queued'] - stats_before['queued']
+        outcome['shed'] = stats_after['shed'] - stats_before['shed']
+
+
+def run_load_test(config: LoadTestConfig) -> LoadTestReport:
+    """Run the configured number of sessions against a local fake completion server."""
+    outcomes: List[Dict] = []
+
+    context = multiprocessing.get_context("spawn")
+    warmed_up = context.Barrier(config.concurrency + 1)
+
+    with FakeCompletionServer(latency=config.server_latency) as server:
+        with ProcessPoolExecutor(
+            max_workers=config.concurrency,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(server.base_url, config.timeout, config.concurrency, warmed_up)
+        ) as pool:
+            # Each submit spawns a worker while none is idle; the barrier then
+            # holds the clock until every worker has finished its warm-up session
+            startup = [pool.submit(time.sleep, 0) for _ in range(config.concurrency)]
+            try:
+                warmed_up.wait(timeout=config.timeout * 4)
+            except BrokenBarrierError:
+                raise RuntimeError("Load test workers failed to warm up") from None
+            for future in startup:
+                future.result()
+
+            start = time.perf_counter()
+            futures = [pool.submit(_run_session, i, config) for i in range(config.sessions)]
+            for future in futures:
+                outcomes.append(future.result())
+            wall_time = time.perf_counter() - start
+            completion_requests = server.request_count
+
+
+            # Untimed pass with tracemalloc enabled. Workers are already warm and each
+            # traced session starts tracing afresh, so it does not matter which
+            # worker runs which session.
+            memory_outcomes = list(pool.map(
+                _run_session,
+                range(config.sessions, config.sessions + config.concurrency),
+                [config] * config.concurrency,
+                [True] * config.concurrency
+            ))
+
+    timings = [timing for outcome in outcomes for timing in outcome['timings']]
+    latencies = [elapsed for _, elapsed in timings]
+    by_action: Dict[str, List[float]] = {}
+    for action, elapsed in timings:
+        by_action.setdefault(action, []).append(elapsed)
+
+    completed = [outcome for outcome in outcomes if outcome['error'] is None]
+    traced = [outcome for outcome in memory_outcomes if outcome['error'] is None]
+
+    return LoadTestReport(
+        label=config.label,
+        sessions=config.sessions,
+        concurrency=config.concurrency,
+        interactions=len(timings),
+        failures=len(outcomes) - len(completed),
+        wall_time=wall_time,
+        throughput=len(timings) / wall_time if wall_time else 0.0,
+        p50_latency=percentile(latencies, 50),
+        p99_latency=percentile(latencies, 99),
+        latency_by_action={
+            action: {
+                'count': len(samples),
+                'p50': percentile(samples, 50),
+                'p99': percentile(samples, 99)
+            }
+            for action, samples in by_action.items()
+        },
+        memory_per_session_kb=(
+            sum(o['memory_kb'] for o in traced) / len(traced) if traced else None
+        ),
+        peak_memory_kb=max((o['peak_memory_kb'] for o in traced), default=None),
+        completion_requests=completion_requests,
+        queued_requests=sum(o['queued'] for o in outcomes),
+        shed_requests=sum(o['shed'] for o in outcomes),
+        errors=[f"session {o['index']}: {o['error']}"
+                for o in outcomes + memory_outcomes if o['error']]
+    )
+
+
+def _format_kib(value: Optional[float]) -> str:
+    """Format a memory figure, or n/a when no session completed."""
+    return "n/a" if value is None else f"{value:.1f} KiB"
+
+
+def format_report(report: LoadTestReport) -> str:
+    """Render a report as plain text."""
+    lines = [
+        f"Load test: {report.label}",
+        f"  Sessions:            {report.sessions} (concurrency {report.concurrency})",
+        f"  Interactions:        {report.interactions} ({report.failures} failed sessions)",
+        f"  Completion requests: {report.completion_requests}",
+        f"  Token budget:        {report.queued_requests} queued, {report.shed_requests} shed",
+        f"  Wall time:           {report.wall_time:.2f} s",
+        f"  Throughput:          {report.throughput:.2f} interactions/s",
+        f"  Latency p50 / p99:   {report.p50_latency * 1000:.0f} ms / {report.p99_latency * 1000:.0f} ms",
+        f"  Memory per session:  {_format_kib(report.memory_per_session_kb)}",
+        f"  Peak session memory: {_format_kib(report.peak_memory_kb)}",
+        "  By action:"
+    ]
+    for action, stats in report.latency_by_action.items():
+        lines.append(
+            f"    {action:<20} n={stats['count']:<5} "
+            f"p50={stats['p50'] * 1000:.0f} ms  p99={stats['p99'] * 1000:.0f} ms"
+        )
+    for error in report.errors:
+        lines.append(f"  Failed {error}")
+    return "\n".join(lines)
+
+
+def format_comparison(baseline: LoadTestReport, candidate: LoadTestReport) -> str:
+    """Render the change in key metrics between two reports."""
+    metrics = [
+        ("Throughput (interactions/s)", "throughput", 1),
+        ("Latency p50 (ms)", "p50_latency", 1000),
+        ("Latency p99 (ms)", "p99_latency", 1000),
+        ("Memory per session (KiB)", "memory_per_session_kb", 1),
+        ("Peak session memory (KiB)", "peak_memory_kb", 1),
+        ("Failed sessions", "failures", 1),
+        ("Queued requests", "queued_requests", 1),
+        ("Shed requests", "shed_requests", 1)
+    ]
+
+    lines = [f"Comparison: {baseline.label} -> {candidate.label}"]
+    for name, attr, scale in metrics:
+        before = getattr(baseline, attr)
+        after = getattr(candidate, attr)
+        if before is None or after is None:
+            lines.append(f"  {name:<28} {'n/a':>10} -> {'n/a':>10}")
+            continue
+        before, after = before * scale, after * scale
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        lines.append(f"  {name:<28} {before:>10.2f} -> {after:>10.2f}  ({change})")
+    return "\n".join(lines)
+
+
+def compare_with(path: Optional[str], report: LoadTestReport) -> Optional[str]:
+    """Compare a report against a saved baseline, if one was given."""
+    if not path:
+        return None
+    return format_comparison(LoadTestReport.load(path), report)
@@ -1,4 +1,5 @@
 from .enums import RiskLevel
 from .lab_result import LabResult
+from .panel_snapshot import PanelSnapshot, StatusCounts
 
-__all__ = ['RiskLevel', 'LabResult']
\ No newline at end of file
+__all__ = ['RiskLevel', 'LabResult', 'PanelSnapshot', 'StatusCounts']
\ No newline at end of file
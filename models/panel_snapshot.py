@@ -0,0 +1,157 @@
+"""Precomputed interpretation of a lab panel."""
+
+import hashlib
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from .enums import RiskLevel
+from .lab_result import LabResult
+
+DISPLAY_COLUMNS = ['Test', 'Value', 'Reference Range', 'Status', 'Description']
+
+EMPTY_CONTEXT = "No lab results available."
+
+CONTEXT_HEADER = "Patient Lab Results:\n\n"
+
+# Quick insight bucket for each risk level
+STATUS_BUCKETS = {
+    RiskLevel.NORMAL: 'normal',
+    RiskLevel.BORDERLINE: 'borderline',
+    RiskLevel.HIGH: 'abnormal',
+    RiskLevel.LOW: 'abnormal',
+    RiskLevel.CRITICAL: 'critical'
+}
+
+
+def format_context_line(result: LabResult) -> str:
+    """Render one lab result as a line of AI context."""
+    return (
+        f"{result.get_status_emoji()} {result.test_name}: {result.value} {result.unit} "
+        f"(Reference: {result.reference_range}) - Status: {result.status.value}\n"
+    )
+
+
+def format_display_row(result: LabResult) -> tuple:
+    """Render one lab result as a row of the display table."""
+    return (
+        result.test_name,
+        f"{result.value} {result.unit}",
+        result.reference_range,
+        result.status.value,
+        result.description
+    )
+
+
+def render_context(lab_results: List[LabResult]) -> str:
+    """Render lab results as context for the AI."""
+    if not lab_results:
+        return EMPTY_CONTEXT
+    return CONTEXT_HEADER + "".join(format_context_line(result) for result in lab_results)
+
+
+def build_display_frame(lab_results: List[LabResult]) -> pd.DataFrame:
+    """Build the display table for lab results."""
+    if not lab_results:
+        return pd.DataFrame()
+    rows = [format_display_row(result) for result in lab_results]
+    return pd.DataFrame.from_records(rows, columns=DISPLAY_COLUMNS)
+
+
+@dataclass(frozen=True)
+class StatusCounts:
+    """Number of results in each quick insight bucket."""
+    normal: int = 0
+    borderline: int = 0
+    abnormal: int = 0
+    critical: int = 0
+
+    @classmethod
+    def from_results(cls, lab_results: Iterable[LabResult]) -> 'StatusCounts':
+        """Count lab results by quick insight bucket."""
+        counts = dict.fromkeys(STATUS_BUCKETS.values(), 0)
+        for result in lab_results:
+            counts[STATUS_BUCKETS[result.status]] += 1
+        return cls(**counts)
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, eq=False)
+class PanelSnapshot:
+    """Immutable, precomputed view of a lab panel shared by all consumers.
+
+    The display frame is built once and kept private; display_frame hands
+    out copies so callers cannot change the cached panel in place.
+    """
+    results: Tuple[LabResult, ...]
+    insights: StatusCounts
+    abnormal: Tuple[LabResult, ...]
+    context: str = field(repr=False)
+    _display_frame: pd.DataFrame = field(repr=False)
+    content_hash: str
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PanelSnapshot):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __hash__(self) -> int:
+        return hash(self.content_hash)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @property
+    def display_frame(self) -> pd.DataFrame:
+        """Copy of the precomputed display table."""
+        return self._display_frame.copy()
+
+    @property
+    def has_critical(self) -> bool:
+        """Check if any result is critical."""
+        return self.insights.critical > 0
+
+    @classmethod
+    def from_results(cls, lab_results: Iterable[LabResult]) -> 'PanelSnapshot':
+        """Build a snapshot in a single pass over the lab results."""
+        results = []
+        abnormal = []
+        context_lines = [CONTEXT_HEADER]
+        rows = []
+        digest = hashlib.sha256()
+        counts = dict.fromkeys(STATUS_BUCKETS.values(), 0)
+
+        for result in lab_results:
+            results.append(result)
+            counts[STATUS_BUCKETS[result.status]] += 1
+
+            if result.is_abnormal():
+                abnormal.append(result)
+
+            context_lines.append(format_context_line(result))
+            row = format_display_row(result)
+            rows.append(row)
+            digest.update("\x1f".join(map(str, row)).encode('utf-8'))
+            digest.update(b"\x1e")
+
+        if results:
+            context = "".join(context_lines)
+            display_frame = pd.DataFrame.from_records(rows, columns=DISPLAY_COLUMNS)
+        else:
+            context = EMPTY_CONTEXT
+            display_frame = pd.DataFrame()
+
+        return cls(
+            results=tuple(results),
+            insights=StatusCounts(**counts),
+            abnormal=tuple(abnormal),
+            context=context,
+            _display_frame=display_frame,
+            content_hash=digest.hexdigest()
+        )
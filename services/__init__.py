@@ -1,5 +1,6 @@
 from .parser import MedicalReportParser
 from .security import SecurityManager
 from .chatbot import MedicalChatbot
+from .governor import TokenGovernor
 
-__all__ = ['MedicalReportParser', 'SecurityManager', 'MedicalChatbot']
\ No newline at end of file
+__all__ = ['MedicalReportParser', 'SecurityManager', 'MedicalChatbot', 'TokenGovernor']
\ No newline at end of file
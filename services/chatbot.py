@@ -2,20 +2,24 @@
 
 import openai
 import logging
-from typing import List, Dict
+from typing import List, Dict, Union
 from openai._exceptions import AuthenticationError, RateLimitError
 
-from models import LabResult, RiskLevel
+from models import LabResult, PanelSnapshot, StatusCounts
+from models.panel_snapshot import render_context
 from config.settings import OPENAI_CONFIG, SYSTEM_PROMPT
 from .security import SecurityManager
+from .governor import TokenGovernor, get_token_governor
 
 logger = logging.getLogger(__name__)
 
+LabPanel = Union[PanelSnapshot, List[LabResult]]
+
 
 class MedicalChatbot:
     """Main chatbot class with OpenAI integration."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, governor: TokenGovernor = None):
         """Initialize the chatbot with OpenAI API key."""
         if not api_key:
             raise ValueError("OpenAI API key is required")
@@ -25,27 +29,23 @@ class MedicalChatbot:
         self.security = SecurityManager()
         self.config = OPENAI_CONFIG
         self.system_prompt = SYSTEM_PROMPT
+        self.governor = governor or get_token_governor()
 
         logger.info("Medical chatbot initialized successfully")
 
-    def generate_context(self, lab_results: List[LabResult]) -> str:
+    def generate_context(self, lab_results: LabPanel) -> str:
         """Generate context from lab results for the AI."""
-        if not lab_results:
-            return "No lab results available."
-
-        context = "Patient Lab Results:\n\n"
-
-        for result in lab_results:
-            status_emoji = result.get_status_emoji()
-            context += (
-                f"{status_emoji} {result.test_name}: {result.value} {result.unit} "
-                f"(Reference: {result.reference_range}) - Status: {result.status.value}\n"
-            )
+        if isinstance(lab_results, PanelSnapshot):
+            return lab_results.context
+        return render_context(lab_results)
 
-        return context
+    def process_query(self, user_query: str, lab_results: LabPanel, session_id: str,
+                      budget_key: str = None) -> str:
+        """Process user query and generate response.
 
-    def process_query(self, user_query: str, lab_results: List[LabResult], session_id: str) -> str:
-        """Process user query and generate response."""
+        The token budget is charged to budget_key, which should outlive
+        session_id resets; it defaults to session_id.
+        """
         try:
             # Validate inputs
             if not user_query.strip():
@@ -66,13 +66,28 @@ class MedicalChatbot:
                 {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {sanitized_query}"}
             ]
 
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.config["model"],
-                messages=messages,
-                max_tokens=self.config["max_tokens"],
-                temperature=self.config["temperature"]
+            # Reserve token budget before calling the API
+            reservation = self.governor.acquire(
+                budget_key or session_id, messages, self.config["max_tokens"]
             )
+            if reservation is None:
+                self.security.log_interaction(session_id, "medical_query", "token_budget_exceeded")
+                return ("You've reached the usage limit for now. "
+                        "Please wait a minute before asking another question.")
+
+            # Call OpenAI API
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.config["model"],
+                    messages=messages,
+                    max_tokens=self.config["max_tokens"],
+                    temperature=self.config["temperature"]
+                )
+            except Exception:
+                self.governor.release(reservation)
+                raise
+
+            self.governor.reconcile(reservation, getattr(response, 'usage', None))
 
             ai_response = response.choices[0].message.content.strip()
 
@@ -94,30 +109,19 @@ class MedicalChatbot:
             return ("I apologize, but I'm experiencing technical difficulties. "
                     "Please try again later or consult your healthcare provider directly.")
 
-    def get_quick_insights(self, lab_results: List[LabResult]) -> Dict[str, int]:
+    def get_quick_insights(self, lab_results: LabPanel) -> Dict[str, int]:
         """Generate quick insights about lab results."""
-        if not lab_results:
-            return {'normal': 0, 'borderline': 0, 'abnormal': 0, 'critical': 0}
-
-        insights = {
-            'normal': 0,
-            'borderline': 0,
-            'abnormal': 0,
-            'critical': 0
+        if isinstance(lab_results, PanelSnapshot):
+            return lab_results.insights.to_dict()
+        return StatusCounts.from_results(lab_results or []).to_dict()
+
+    def get_usage_stats(self, budget_key: str) -> Dict[str, Dict[str, float]]:
+        """Get token usage counters for the session and the whole process."""
+        return {
+            'session': self.governor.get_session_stats(budget_key),
+            'process': self.governor.get_process_stats()
         }
 
-        for result in lab_results:
-            if result.status == RiskLevel.NORMAL:
-                insights['normal'] += 1
-            elif result.status == RiskLevel.BORDERLINE:
-                insights['borderline'] += 1
-            elif result.status in [RiskLevel.HIGH, RiskLevel.LOW]:
-                insights['abnormal'] += 1
-            elif result.status == RiskLevel.CRITICAL:
-                insights['critical'] += 1
-
-        return insights
-
     def get_suggested_questions(self) -> List[str]:
         """Get list of suggested questions for users."""
         return [
@@ -0,0 +1,314 @@
+"""Token estimation and budget enforcement for OpenAI requests."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from config.settings import TOKEN_BUDGET_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Chat format overhead per message and for priming the reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+# Source URL (which tiktoken hashes into its cache file name) and expected SHA-256
+ENCODING_FILES = {
+    "cl100k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+        "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7"
+    )
+}
+
+
+def load_encoding(encoding_name: Optional[str], cache_dir: Optional[str]):
+    """Load a tiktoken encoding from the local cache only, or None to use the estimator.
+
+    tiktoken downloads missing encodings with no timeout, so the cached file is
+    checked here first and tiktoken is only called once it is known to be present.
+    """
+    if not encoding_name or not cache_dir:
+        return None
+
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    if encoding_name not in ENCODING_FILES:
+        logger.warning(f"Unknown tokenizer encoding {encoding_name}, using estimator")
+        return None
+
+    url, expected_hash = ENCODING_FILES[encoding_name]
+    cache_path = os.path.join(cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        logger.info(f"No cached {encoding_name} tokenizer in {cache_dir}, using estimator")
+        return None
+
+    if hashlib.sha256(data).hexdigest() != expected_hash:
+        logger.warning(f"Cached {encoding_name} tokenizer is corrupt, using estimator")
+        return None
+
+    # Point tiktoken at the verified cache only for this call
+    previous_cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+    os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, using estimator: {str(e)}")
+        return None
+    finally:
+        if previous_cache_dir is None:
+            os.environ.pop("TIKTOKEN_CACHE_DIR", None)
+        else:
+            os.environ["TIKTOKEN_CACHE_DIR"] = previous_cache_dir
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to a fixed capacity."""
+
+    def __init__(self, capacity: float, tokens_per_minute: float):
+        self.capacity = capacity
+        self.refill_rate = tokens_per_minute / 60.0
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        """Add tokens accrued since the last update."""
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until the bucket holds the requested amount."""
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def adjust(self, delta: float):
+        """Return (positive) or charge (negative) tokens; may go into debt."""
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+@dataclass
+class TokenReservation:
+    """Tokens held for a single in-flight request."""
+    session_id: str
+    prompt_estimate: int
+    completion_limit: int
+    prompt_chars: int
+    message_count: int
+
+    @property
+    def total(self) -> int:
+        return self.prompt_estimate + self.completion_limit
+
+
+class TokenGovernor:
+    """Enforces per-session and per-process token-rate budgets."""
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config or TOKEN_BUDGET_CONFIG
+        self._encoding = load_encoding(
+            self.config.get("tokenizer_encoding"),
+            self.config.get("tokenizer_cache_dir")
+        )
+        self._lock = threading.Lock()
+        self._process_bucket = TokenBucket(
+            self.config["process_burst_tokens"],
+            self.config["process_tokens_per_minute"]
+        )
+        self._session_buckets: Dict[str, TokenBucket] = {}
+        self._session_stats: Dict[str, Dict[str, int]] = {}
+        self._process_stats = self._empty_stats()
+        self._chars_per_token = self.config["default_chars_per_token"]
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            'requests': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'estimated_prompt_tokens': 0,
+            'queued': 0,
+            'shed': 0
+        }
+
+    @property
+    def uses_tokenizer(self) -> bool:
+        """Whether estimates come from a real tokenizer."""
+        return self._encoding is not None
+
+    def estimate_prompt_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Estimate prompt tokens locally before sending a request."""
+        encoding = self._encoding
+        tokens = TOKENS_PER_REPLY
+
+        for message in messages:
+            content = message.get("content", "")
+            if encoding is not None:
+                tokens += len(encoding.encode(content))
+            else:
+                tokens += int(len(content) / self._chars_per_token) + 1
+            tokens += TOKENS_PER_MESSAGE
+
+        return tokens
+
+    def _get_session_bucket(self, session_id: str, now: float) -> TokenBucket:
+        """Get the bucket for a session, pruning ones idle past the TTL."""
+        ttl = self.config["session_idle_ttl_seconds"]
+        stale = [sid for sid, bucket in self._session_buckets.items()
+                 if sid != session_id and now - bucket.updated_at > ttl]
+        for sid in stale:
+            del self._session_buckets[sid]
+            self._session_stats.pop(sid, None)
+
+        if session_id not in self._session_buckets:
+            self._session_buckets[session_id] = TokenBucket(
+                self.config["session_burst_tokens"],
+                self.config["session_tokens_per_minute"]
+            )
+            self._session_stats[session_id] = self._empty_stats()
+
+        return self._session_buckets[session_id]
+
+    def acquire(self, session_id: str, messages: List[Dict[str, str]],
+                completion_limit: int) -> Optional[TokenReservation]:
+        """Reserve tokens for a request, queueing briefly or shedding it if over budget."""
+        reservation = TokenReservation(
+            session_id=session_id,
+            prompt_estimate=self.estimate_prompt_tokens(messages),
+            completion_limit=completion_limit,
+            prompt_chars=sum(len(m.get("content", "")) for m in messages),
+            message_count=len(messages)
+        )
+        amount = reservation.total
+        deadline = time.monotonic() + self.config["max_queue_wait_seconds"]
+        queued = False
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                session_bucket = self._get_session_bucket(session_id, now)
+                session_bucket.refill(now)
+                self._process_bucket.refill(now)
+
+                if amount > session_bucket.capacity or amount > self._process_bucket.capacity:
+                    wait = None
+                else:
+                    wait = max(session_bucket.wait_time(amount),
+                               self._process_bucket.wait_time(amount))
+
+                if wait == 0.0:
+                    session_bucket.adjust(-amount)
+                    self._process_bucket.adjust(-amount)
+                    return reservation
+
+                if wait is None or now + wait > deadline:
+                    self._session_stats[session_id]['shed'] += 1
+                    self._process_stats['shed'] += 1
+                    logger.warning(f"Request shed: {amount} tokens exceeds available budget")
+                    return None
+
+                if not queued:
+                    self._session_stats[session_id]['queued'] += 1
+                    self._process_stats['queued'] += 1
+                    queued = True
+
+            time.sleep(wait)
+
+    def release(self, reservation: TokenReservation):
+        """Return the full reservation when a request did not reach the API."""
+        with self._lock:
+            self._refund(reservation.session_id, reservation.total)
+
+    def reconcile(self, reservation: TokenReservation, usage) -> int:
+        """Settle a reservation against the usage reported by the API."""
+        prompt_tokens = getattr(usage, 'prompt_tokens', None) if usage else None
+        completion_tokens = getattr(usage, 'completion_tokens', None) if usage else None
+
+        if prompt_tokens is None:
+            prompt_tokens = reservation.prompt_estimate
+        if completion_tokens is None:
+            completion_tokens = reservation.completion_limit
+
+        actual = prompt_tokens + completion_tokens
+
+        with self._lock:
+            self._refund(reservation.session_id, reservation.total - actual)
+
+            for stats in (self._session_stats.get(reservation.session_id), self._process_stats):
+                if stats is None:
+                    continue
+                stats['requests'] += 1
+                stats['prompt_tokens'] += prompt_tokens
+                stats['completion_tokens'] += completion_tokens
+                stats['estimated_prompt_tokens'] += reservation.prompt_estimate
+
+            # Calibrate the fallback estimator against real prompt sizes, leaving
+            # out the chat format overhead that prompt_chars does not include
+            overhead = TOKENS_PER_REPLY + TOKENS_PER_MESSAGE * reservation.message_count
+            content_tokens = prompt_tokens - overhead
+            if usage and not self.uses_tokenizer and content_tokens > 0:
+                observed = reservation.prompt_chars / content_tokens
+                self._chars_per_token = 0.8 * self._chars_per_token + 0.2 * observed
+
+        return actual
+
+    def _refund(self, session_id: str, amount: float):
+        """Credit tokens back to the session and process buckets. Caller holds the lock."""
+        session_bucket = self._session_buckets.get(session_id)
+        if session_bucket is not None:
+            session_bucket.adjust(amount)
+        self._process_bucket.adjust(amount)
+
+    def get_session_stats(self, session_id: str) -> Dict[str, float]:
+        """Get token counters and remaining budget for a session."""
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_session_bucket(session_id, now)
+            bucket.refill(now)
+            stats = dict(self._session_stats[session_id])
+            stats['available_tokens'] = max(0, int(bucket.tokens))
+            return stats
+
+    def get_process_stats(self) -> Dict[str, float]:
+        """Get token counters and remaining budget for the whole process."""
+        with self._lock:
+            self._process_bucket.refill(time.monotonic())
+            stats = dict(self._process_stats)
+            stats['available_tokens'] = max(0, int(self._process_bucket.tokens))
+            stats['active_sessions'] = len(self._session_buckets)
+            return stats
+
+
+_governor: Optional[TokenGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_token_governor() -> TokenGovernor:
+    """Get the process-wide governor shared by all sessions.
+
+    The tokenizer is loaded here, once and under a lock, rather than per request.
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = TokenGovernor()
+        return _governor
+
+
+def install_token_governor(governor: TokenGovernor):
+    """Replace the process-wide governor, e.g. with budgets sized for a load test."""
+    global _governor
+    with _governor_lock:
+        _governor = governor
@@ -1,9 +1,9 @@
 """Medical report parsing and interpretation service."""
 
-from typing import List
+from typing import Iterator, List
 import logging
 
-from models import LabResult, RiskLevel
+from models import LabResult, PanelSnapshot, RiskLevel
 from config.settings import REFERENCE_RANGES, TEST_DESCRIPTIONS, SAMPLE_LAB_DATA
 
 logger = logging.getLogger(__name__)
@@ -47,26 +47,32 @@ class MedicalReportParser:
         """Get description for lab tests."""
         return self.test_descriptions.get(test_name, 'Lab test result')
 
-    def parse_sample_report(self) -> List[LabResult]:
-        """Generate sample lab results for demonstration."""
-        results = []
-
+    def _iter_sample_results(self) -> Iterator[LabResult]:
+        """Yield interpreted sample lab results one at a time."""
         for name, value, unit, ref_range in SAMPLE_LAB_DATA:
-            status = self.determine_status(name, value)
-            description = self.get_test_description(name)
-
-            results.append(LabResult(
+            yield LabResult(
                 test_name=name,
                 value=value,
                 unit=unit,
                 reference_range=ref_range,
-                status=status,
-                description=description
-            ))
+                status=self.determine_status(name, value),
+                description=self.get_test_description(name)
+            )
+
+    def parse_sample_report(self) -> List[LabResult]:
+        """Generate sample lab results for demonstration."""
+        results = list(self._iter_sample_results())
 
         logger.info(f"Generated {len(results)} sample lab results")
         return results
 
+    def parse_sample_panel(self) -> PanelSnapshot:
+        """Parse the sample report straight into a precomputed panel snapshot."""
+        snapshot = PanelSnapshot.from_results(self._iter_sample_results())
+
+        logger.info(f"Generated snapshot of {len(snapshot)} sample lab results")
+        return snapshot
+
     def parse_uploaded_report(self, file_content: str) -> List[LabResult]:
         """Parse uploaded lab report (placeholder for future implementation)."""
         # TODO: Implement actual file parsing logic
@@ -0,0 +1,180 @@
+"""Tests for the token budget governor."""
+
+import hashlib
+import os
+from types import SimpleNamespace
+
+import pytest
+import tiktoken
+
+from config.settings import TOKEN_BUDGET_CONFIG
+from services import governor as governor_module
+from services.governor import TokenGovernor
+
+# 400 characters -> 100 content tokens + 1, plus message and reply overhead
+MESSAGES = [{"role": "user", "content": "x" * 400}]
+PROMPT_ESTIMATE = 108
+
+
+class FakeClock:
+    """Stands in for the time module so queueing does not really sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(governor_module, "time", fake)
+    return fake
+
+
+def make_governor(**overrides) -> TokenGovernor:
+    config = dict(TOKEN_BUDGET_CONFIG)
+    config.update({
+        "session_tokens_per_minute": 600,
+        "session_burst_tokens": 1000,
+        "process_tokens_per_minute": 6000,
+        "process_burst_tokens": 10000,
+        "max_queue_wait_seconds": 10.0,
+        "session_idle_ttl_seconds": 60,
+        "default_chars_per_token": 4.0,
+        "tokenizer_encoding": None
+    })
+    config.update(overrides)
+    return TokenGovernor(config)
+
+
+def usage(prompt_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+def test_estimate_includes_message_overhead(clock):
+    governor = make_governor()
+    assert governor.estimate_prompt_tokens(MESSAGES) == PROMPT_ESTIMATE
+
+
+def test_request_larger_than_capacity_is_shed(clock):
+    governor = make_governor()
+
+    assert governor.acquire("s1", MESSAGES, 2000) is None
+    assert clock.now == 1000.0
+    assert governor.get_session_stats("s1")['shed'] == 1
+    assert governor.get_process_stats()['shed'] == 1
+
+
+def test_request_queues_until_budget_refills(clock):
+    governor = make_governor()
+    assert governor.acquire("s1", MESSAGES, 792) is not None  # 900 tokens
+
+    # 500 needed, 100 left, refilling at 10 tokens/s -> 40 s, past the 10 s deadline
+    assert governor.acquire("s1", MESSAGES, 392) is None
+    assert clock.now == 1000.0
+
+    # 150 needed -> 5 s, within the deadline
+    reservation = governor.acquire("s1", MESSAGES, 42)
+    assert reservation is not None
+    assert clock.now == pytest.approx(1005.0)
+    assert governor.get_session_stats("s1")['queued'] == 1
+    assert governor.get_session_stats("s1")['shed'] == 1
+
+
+def test_release_refunds_reservation(clock):
+    governor = make_governor()
+    reservation = governor.acquire("s1", MESSAGES, 500)
+    assert governor.get_session_stats("s1")['available_tokens'] == 1000 - reservation.total
+
+    governor.release(reservation)
+
+    assert governor.get_session_stats("s1")['available_tokens'] == 1000
+    assert governor.get_process_stats()['available_tokens'] == 10000
+    assert governor.get_session_stats("s1")['requests'] == 0
+
+
+def test_reconcile_refunds_unused_completion_tokens(clock):
+    governor = make_governor()
+    reservation = governor.acquire("s1", MESSAGES, 500)
+
+    assert governor.reconcile(reservation, usage(100, 50)) == 150
+
+    stats = governor.get_session_stats("s1")
+    assert stats['available_tokens'] == 850
+    assert stats['requests'] == 1
+    assert stats['prompt_tokens'] == 100
+    assert stats['completion_tokens'] == 50
+    assert stats['estimated_prompt_tokens'] == PROMPT_ESTIMATE
+
+
+def test_underestimate_puts_bucket_into_debt(clock):
+    governor = make_governor()
+    reservation = governor.acquire("s1", MESSAGES, 500)
+
+    governor.reconcile(reservation, usage(900, 400))
+
+    assert governor._session_buckets["s1"].tokens == pytest.approx(-300)
+    assert governor.get_session_stats("s1")['available_tokens'] == 0
+
+    # Paying off the debt plus a 108-token request takes longer than the deadline
+    assert governor.acquire("s1", MESSAGES, 0) is None
+
+
+def test_idle_sessions_are_pruned(clock):
+    governor = make_governor()
+    governor.acquire("s1", MESSAGES, 0)
+
+    clock.now += 61
+    governor.acquire("s2", MESSAGES, 0)
+
+    assert "s1" not in governor._session_buckets
+    assert governor.get_process_stats()['active_sessions'] == 1
+
+
+def test_calibration_excludes_format_overhead(clock):
+    governor = make_governor()
+    reservation = governor.acquire("s1", MESSAGES, 0)
+
+    # 200 content tokens for 400 characters, plus 7 overhead tokens
+    governor.reconcile(reservation, usage(207, 0))
+
+    assert governor._chars_per_token == pytest.approx(0.8 * 4.0 + 0.2 * 2.0)
+
+
+def test_load_encoding_uses_verified_cache_and_restores_environment(tmp_path, monkeypatch):
+    data = b"fake encoding"
+    url = "https://example.invalid/fake.tiktoken"
+    cache_file = tmp_path / hashlib.sha1(url.encode('utf-8')).hexdigest()
+    cache_file.write_bytes(data)
+    monkeypatch.setitem(governor_module.ENCODING_FILES, "fake_base",
+                        (url, hashlib.sha256(data).hexdigest()))
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", "/previous")
+
+    seen = {}
+
+    def fake_get_encoding(name):
+        seen['cache_dir'] = os.environ["TIKTOKEN_CACHE_DIR"]
+        return name
+
+    monkeypatch.setattr(tiktoken, "get_encoding", fake_get_encoding)
+
+    assert governor_module.load_encoding("fake_base", str(tmp_path)) == "fake_base"
+    assert seen['cache_dir'] == str(tmp_path)
+    assert os.environ["TIKTOKEN_CACHE_DIR"] == "/previous"
+
+
+def test_load_encoding_skips_missing_or_corrupt_cache(tmp_path, monkeypatch):
+    def fail_get_encoding(name):
+        raise AssertionError("tiktoken must not be called without a verified cache")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", fail_get_encoding)
+    assert governor_module.load_encoding("cl100k_base", str(tmp_path)) is None
+
+    url, _ = governor_module.ENCODING_FILES["cl100k_base"]
+    (tmp_path / hashlib.sha1(url.encode('utf-8')).hexdigest()).write_bytes(b"corrupt")
+    assert governor_module.load_encoding("cl100k_base", str(tmp_path)) is None
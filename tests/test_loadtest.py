@@ -0,0 +1,133 @@
+"""Tests for the load testing harness helpers."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from loadtest import FakeCompletionServer, LoadTestReport
+from loadtest.harness import format_comparison, format_report, percentile
+
+
+def make_report(**overrides) -> LoadTestReport:
+    fields = dict(
+        label="baseline",
+        sessions=2,
+        concurrency=1,
+        interactions=10,
+        failures=0,
+        wall_time=5.0,
+        throughput=2.0,
+        p50_latency=0.1,
+        p99_latency=0.5,
+        memory_per_session_kb=100.0,
+        peak_memory_kb=200.0
+    )
+    fields.update(overrides)
+    return LoadTestReport(**fields)
+
+
+def post(url: str, payload: dict):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_percentile_empty_list():
+    assert percentile([], 50) == 0.0
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile(samples, 100) == 100
+    assert percentile(samples, 0) == 1
+
+
+def test_percentile_small_samples_and_order():
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([3, 1, 2], 99) == 3
+
+
+def test_format_comparison_handles_missing_memory():
+    baseline = make_report(memory_per_session_kb=None, peak_memory_kb=None)
+    candidate = make_report(label="candidate")
+
+    lines = format_comparison(baseline, candidate).splitlines()
+
+    assert lines[0] == "Comparison: baseline -> candidate"
+    memory_line = next(line for line in lines if "Memory per session" in line)
+    assert "n/a" in memory_line
+
+
+def test_format_comparison_zero_baseline():
+    baseline = make_report(failures=0)
+    candidate = make_report(label="candidate", failures=3)
+
+    failure_line = next(
+        line for line in format_comparison(baseline, candidate).splitlines()
+        if "Failed sessions" in line
+    )
+    assert "3.00" in failure_line
+    assert "(n/a)" in failure_line
+
+
+def test_format_comparison_reports_change():
+    candidate = make_report(label="candidate", throughput=3.0)
+
+    throughput_line = next(
+        line for line in format_comparison(make_report(), candidate).splitlines()
+        if "Throughput" in line
+    )
+    assert "+50.0%" in throughput_line
+
+
+def test_format_report_shows_missing_memory_as_na():
+    report = make_report(memory_per_session_kb=None, peak_memory_kb=None,
+                         errors=["session 0: initial_load: boom"])
+    text = format_report(report)
+
+    assert "Memory per session:  n/a" in text
+    assert "Failed session 0: initial_load: boom" in text
+
+
+def test_report_round_trips_through_json(tmp_path):
+    report = make_report(queued_requests=2, shed_requests=1)
+    path = tmp_path / "report.json"
+
+    report.save(str(path))
+
+    assert LoadTestReport.load(str(path)) == report
+
+
+def test_fake_server_returns_completion_with_usage():
+    with FakeCompletionServer() as server:
+        body = post(f"{server.base_url}/chat/completions", {
+            "model": "gpt-test",
+            "messages": [{"role": "user", "content": "x" * 40}]
+        })
+        assert server.request_count == 1
+
+    assert body["model"] == "gpt-test"
+    assert body["choices"][0]["message"]["role"] == "assistant"
+    usage = body["usage"]
+    assert usage["prompt_tokens"] == 10
+    assert usage["completion_tokens"] > 0
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
+
+
+def test_fake_server_rejects_other_paths():
+    with FakeCompletionServer() as server:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            post(f"{server.base_url}/embeddings", {"input": "x"})
+        assert server.request_count == 0
+
+    assert excinfo.value.code == 404
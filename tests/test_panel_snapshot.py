@@ -0,0 +1,95 @@
+"""Tests for the precomputed lab panel snapshot."""
+
+import pickle
+from dataclasses import replace
+
+from models import LabResult, PanelSnapshot, RiskLevel, StatusCounts
+from models.panel_snapshot import EMPTY_CONTEXT, build_display_frame, render_context
+from services import MedicalReportParser
+from utils.helpers import format_lab_results_dataframe
+
+
+def make_results():
+    return [
+        LabResult('Glucose', 95, 'mg/dL', '70-100', RiskLevel.BORDERLINE, 'Blood sugar'),
+        LabResult('Hemoglobin', 13.5, 'g/dL', '12.0-16.0', RiskLevel.NORMAL, 'Oxygen carrier'),
+        LabResult('Triglycerides', 180, 'mg/dL', '<150', RiskLevel.HIGH, 'Blood fat'),
+        LabResult('Vitamin D', 25, 'ng/mL', '30-100', RiskLevel.LOW, 'Bone health'),
+        LabResult('TSH', 9.5, 'mIU/L', '0.4-4.0', RiskLevel.CRITICAL, 'Thyroid hormone'),
+    ]
+
+
+def test_from_results_matches_separate_helpers():
+    results = make_results()
+    snapshot = PanelSnapshot.from_results(results)
+
+    assert snapshot.results == tuple(results)
+    assert snapshot.context == render_context(results)
+    assert snapshot.display_frame.equals(build_display_frame(results))
+    assert snapshot.insights == StatusCounts.from_results(results)
+    assert snapshot.insights == StatusCounts(normal=1, borderline=1, abnormal=2, critical=1)
+    assert [r.test_name for r in snapshot.abnormal] == ['Triglycerides', 'Vitamin D', 'TSH']
+    assert snapshot.has_critical
+
+
+def test_from_results_consumes_iterator_once():
+    results = make_results()
+    snapshot = PanelSnapshot.from_results(iter(results))
+    assert len(snapshot) == len(results)
+
+
+def test_empty_panel():
+    snapshot = PanelSnapshot.from_results([])
+
+    assert not snapshot
+    assert snapshot.context == EMPTY_CONTEXT
+    assert snapshot.display_frame.empty
+    assert snapshot.insights == StatusCounts()
+    assert not snapshot.has_critical
+
+
+def test_pickle_round_trip():
+    snapshot = MedicalReportParser().parse_sample_panel()
+    restored = pickle.loads(pickle.dumps(snapshot))
+
+    assert restored == snapshot
+    assert restored.context == snapshot.context
+    assert restored.insights == snapshot.insights
+    assert restored.display_frame.equals(snapshot.display_frame)
+
+
+def test_content_hash_is_stable():
+    assert (PanelSnapshot.from_results(make_results()).content_hash
+            == PanelSnapshot.from_results(make_results()).content_hash)
+
+
+def test_content_hash_changes_with_content():
+    results = make_results()
+    baseline = PanelSnapshot.from_results(results)
+
+    changed_value = results[:]
+    changed_value[0] = replace(results[0], value=96)
+    changed_status = results[:]
+    changed_status[1] = replace(results[1], status=RiskLevel.HIGH)
+
+    hashes = {
+        baseline.content_hash,
+        PanelSnapshot.from_results(changed_value).content_hash,
+        PanelSnapshot.from_results(changed_status).content_hash,
+        PanelSnapshot.from_results(results[::-1]).content_hash,
+    }
+    assert len(hashes) == 4
+    assert PanelSnapshot.from_results(changed_value) != baseline
+
+
+def test_display_frame_cannot_change_snapshot():
+    snapshot = PanelSnapshot.from_results(make_results())
+    original = snapshot.display_frame
+
+    frame = snapshot.display_frame
+    frame.iloc[0, 0] = 'X'
+    helper_frame = format_lab_results_dataframe(snapshot)
+    helper_frame.iloc[0, 0] = 'X'
+
+    assert snapshot.display_frame.equals(original)
+    assert snapshot == PanelSnapshot.from_results(make_results())
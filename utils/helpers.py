@@ -1,27 +1,17 @@
 """Utility functions for the medical chatbot application."""
 
 import pandas as pd
-from typing import List, Callable
+from typing import List, Callable, Union
 
-from models import LabResult, RiskLevel
+from models import LabResult, PanelSnapshot, RiskLevel
+from models.panel_snapshot import build_display_frame
 
 
-def format_lab_results_dataframe(lab_results: List[LabResult]) -> pd.DataFrame:
+def format_lab_results_dataframe(lab_results: Union[PanelSnapshot, List[LabResult]]) -> pd.DataFrame:
     """Convert lab results to a formatted pandas DataFrame."""
-    if not lab_results:
-        return pd.DataFrame()
-
-    results_data = []
-    for result in lab_results:
-        results_data.append({
-            'Test': result.test_name,
-            'Value': f"{result.value} {result.unit}",
-            'Reference Range': result.reference_range,
-            'Status': result.status.value,
-            'Description': result.description
-        })
-
-    return pd.DataFrame(results_data)
+    if isinstance(lab_results, PanelSnapshot):
+        return lab_results.display_frame
+    return build_display_frame(lab_results)
 
 
 def get_status_color(status: str) -> str: